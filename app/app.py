@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import io
 import sys
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import Dict, List, Sequence
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import streamlit as st
 
 # Ensure the core package is on the path when running via `streamlit run`
@@ -16,30 +20,102 @@ if str(ROOT) not in sys.path:
 
 from app.components.controls import FilterSelection, render_percentile_rank_filters
 from core import aggregate
-from core.ingest import IngestResult, ingest_contest
+from core.ingest import ingest_contest
 
 st.set_page_config(page_title="DFS Contest Analyzer", layout="wide")
 
 
-def _save_upload(upload: Any) -> Path:
-    tmp = NamedTemporaryFile(delete=False, suffix=".csv")
-    tmp.write(upload.getvalue())
-    tmp.close()
-    return Path(tmp.name)
+@st.cache_data(show_spinner=False)
+def _cached_ingest(standings_bytes: bytes, salaries_bytes: bytes) -> Dict[str, object]:
+    """Run the pipeline and keep only paths + small metadata in the cache.
+
+    The derived tables live in the Parquet files ingest already writes;
+    holding them here too would pin every table in the Python heap.
+    """
+    result = ingest_contest(io.BytesIO(standings_bytes), io.BytesIO(salaries_bytes))
+    return {
+        "table_paths": {name: str(result.output_dir / f"{name}.parquet") for name in result.tables},
+        "output_dir": str(result.output_dir),
+        "unmatched_players": result.unmatched_players,
+        "ingest_time": result.ingest_time,
+    }
 
 
 def _format_lineup(players: Sequence[str]) -> str:
     return " | ".join(players)
 
 
-def _combo_display(frame: pd.DataFrame, entry_ids: Iterable[int], top_n: int) -> pd.DataFrame:
+def _entry_positions(entries: pd.DataFrame) -> pd.Series:
+    """Map entry_id -> contest-wide bit position (row order in Entries)."""
+    ids = entries["entry_id"].to_numpy(dtype=np.int64, na_value=-1)
+    return pd.Series(np.arange(len(ids), dtype=np.int64), index=pd.Index(ids))
+
+
+@st.cache_resource(show_spinner=False)
+def _open_dataset(path: str) -> ds.Dataset:
+    return ds.dataset(path)
+
+
+@st.cache_data(show_spinner=False)
+def _load_table(path: str) -> pd.DataFrame:
+    # ignore_metadata: the stored pandas dtype string for the Arrow-backed
+    # entry_ids column does not round-trip; _compact_frame restores dtypes.
+    return _compact_frame(_open_dataset(path).to_table().to_pandas(ignore_metadata=True))
+
+
+def _table(name: str) -> pd.DataFrame:
+    paths: Dict[str, str] = st.session_state.get("contest_table_paths") or {}
+    path = paths.get(name)
+    if not path:
+        return pd.DataFrame()
+    return _load_table(path)
+
+
+@st.cache_data(show_spinner=False)
+def _exploded_by_entry(path: str) -> pd.DataFrame:
+    """EntriesExploded indexed by entry_id for searchsorted row slicing.
+
+    Ingest writes the exploded table sorted by entry_id, so the index is
+    monotonic and `aggregate.take_sorted_rows` can slice it directly.
+    """
+    return _load_table(path).set_index("entry_id", drop=False)
+
+
+@st.cache_data(show_spinner=False)
+def _lowered_column(path: str, column: str) -> pd.Series:
+    """Lowercased copy of one string column, computed once per contest."""
+    return _load_table(path)[column].astype(str).str.lower()
+
+
+@st.cache_data(show_spinner=False)
+def _user_search_index(path: str) -> pd.DataFrame:
+    users = sorted(_load_table(path)["username"].dropna().unique().tolist())
+    return pd.DataFrame({"username": users, "username_lower": [user.lower() for user in users]})
+
+
+@st.cache_resource(show_spinner=False)
+def _combo_bitsets(table_name: str, cache_token: str) -> np.ndarray:
+    """Entry-membership bitsets for one combo/stack table, one row per combo."""
+    entries = _table("Entries")
+    frame = _table(table_name)
+    if frame.empty:
+        return np.zeros((0, (len(entries) + 63) // 64), dtype=np.uint64)
+    return aggregate.build_entry_bitsets(frame["entry_ids"], _entry_positions(entries), len(entries))
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: lambda _: 0, np.ndarray: lambda _: 0})
+def _combo_display(frame: pd.DataFrame, combo_bits: np.ndarray, filter_bits: np.ndarray, has_filter: bool, top_n: int, cache_key: str) -> pd.DataFrame:
+    """Filter + sort one combo view; memoized so unrelated widget clicks skip it.
+
+    The frame and bitsets are fully determined by `cache_key` (contest, view,
+    filter selection), so they are excluded from hashing.
+    """
     if frame is None or frame.empty:
         return pd.DataFrame()
-    id_set = set(entry_ids)
     display = frame.copy()
-    if id_set:
-        display["count_in_current_percentile"] = display["entry_ids"].apply(
-            lambda ids: int(sum(1 for value in (ids or []) if value in id_set))
+    if has_filter:
+        display["count_in_current_percentile"] = aggregate.popcount_intersection(
+            combo_bits[display.index.to_numpy()], filter_bits
         )
         display = display[display["count_in_current_percentile"] > 0]
     else:
@@ -48,20 +124,30 @@ def _combo_display(frame: pd.DataFrame, entry_ids: Iterable[int], top_n: int) ->
     return display.head(top_n)
 
 
-def _downloadable_csv(frame: pd.DataFrame) -> bytes:
+def _join_list_column(column: pd.Series, sep: str) -> list:
+    """Join each row's list into one string inside Arrow's C++ kernels."""
+    if isinstance(column.dtype, pd.ArrowDtype):
+        values = column.array._pa_array.combine_chunks()
+    else:
+        values = pa.array(column.tolist())
+    return pc.binary_join(values.cast(pa.list_(pa.string())), sep).to_pylist()
+
+
+@st.cache_data(show_spinner=False, max_entries=16, hash_funcs={pd.DataFrame: lambda _: 0})
+def _downloadable_csv(frame: pd.DataFrame, cache_key: str) -> bytes:
     if frame.empty:
         return b""
     export = frame.copy()
     if "entry_ids" in export.columns:
-        export["entry_ids"] = export["entry_ids"].apply(lambda values: ",".join(str(v) for v in values))
+        export["entry_ids"] = _join_list_column(export["entry_ids"], ",")
     if "players" in export.columns:
-        export["players"] = export["players"].apply(lambda values: " | ".join(values))
+        export["players"] = _join_list_column(export["players"], " | ")
     return export.to_csv(index=False).encode("utf-8")
 
 
 def _ensure_session_state() -> None:
     for key in [
-        "contest_tables",
+        "contest_table_paths",
         "contest_output_dir",
         "unmatched_players",
         "ingest_time",
@@ -69,11 +155,65 @@ def _ensure_session_state() -> None:
         st.session_state.setdefault(key, None)
 
 
-def _store_result(result: IngestResult) -> None:
-    st.session_state["contest_tables"] = {name: df.copy() for name, df in result.tables.items()}
-    st.session_state["contest_output_dir"] = str(result.output_dir)
-    st.session_state["unmatched_players"] = result.unmatched_players
-    st.session_state["ingest_time"] = result.ingest_time
+# Narrow dtypes applied to tables as they come off Parquet: every
+# filter/groupby/copy downstream pays for bytes moved, so halve the numerics
+# and dictionary-encode the repetitive string columns.
+_FLOAT32_COLUMNS = {
+    "points",
+    "percentile",
+    "salary",
+    "salary_sum",
+    "salary_avg",
+    "salary_min",
+    "salary_max",
+    "field_pct",
+    "fpts",
+    "user_exposure_pct",
+    "delta_vs_field",
+    "best_percentile",
+    "median_rank",
+    "max_points",
+}
+_INT32_COLUMNS = {"rank", "best_rank", "frequency", "entry_count", "user_total_lineups", "salary_missing_count"}
+_INT16_COLUMNS = {"dupe_count", "entries_used", "entries_max", "size"}
+_CATEGORY_COLUMNS = {
+    "player",
+    "team",
+    "game_id",
+    "username",
+    "username_lc",
+    "roster_slot",
+    "roster_position",
+    "dk_roster_position",
+    "away_team",
+    "home_team",
+    "time_remaining",
+}
+
+
+def _compact_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    mapping: Dict[str, object] = {}
+    for column in frame.columns:
+        if column in _FLOAT32_COLUMNS:
+            mapping[column] = "float32"
+        elif column in _INT32_COLUMNS:
+            mapping[column] = "Int32" if frame[column].isna().any() else "int32"
+        elif column in _INT16_COLUMNS:
+            mapping[column] = "int16"
+        elif column in _CATEGORY_COLUMNS:
+            mapping[column] = "category"
+        elif column == "entry_ids":
+            # Parquet round-trips list columns as object-of-ndarray; keep the
+            # Arrow (offsets, values) layout instead of Python list rows.
+            mapping[column] = pd.ArrowDtype(pa.list_(pa.int64()))
+    return frame.astype(mapping) if mapping else frame
+
+
+def _store_result(summary: Dict[str, object]) -> None:
+    st.session_state["contest_table_paths"] = summary["table_paths"]
+    st.session_state["contest_output_dir"] = summary["output_dir"]
+    st.session_state["unmatched_players"] = summary["unmatched_players"]
+    st.session_state["ingest_time"] = summary["ingest_time"]
 
 
 def _load_sample() -> None:
@@ -81,8 +221,8 @@ def _load_sample() -> None:
     standings = sample_dir / "sample_standings.csv"
     salaries = sample_dir / "sample_salaries.csv"
     with st.spinner("Ingesting sample contest..."):
-        result = ingest_contest(standings, salaries)
-    _store_result(result)
+        summary = _cached_ingest(standings.read_bytes(), salaries.read_bytes())
+    _store_result(summary)
     st.success("Sample contest loaded", icon="✅")
 
 
@@ -90,16 +230,10 @@ def _ingest_uploaded(standings_file, salaries_file) -> None:
     if not standings_file or not salaries_file:
         st.error("Please provide both the contest standings and salary CSV files.")
         return
-    standings_path = _save_upload(standings_file)
-    salaries_path = _save_upload(salaries_file)
-    try:
-        with st.spinner("Ingesting contest..."):
-            result = ingest_contest(standings_path, salaries_path)
-        _store_result(result)
-        st.success("Contest ingested successfully", icon="✅")
-    finally:
-        standings_path.unlink(missing_ok=True)
-        salaries_path.unlink(missing_ok=True)
+    with st.spinner("Ingesting contest..."):
+        summary = _cached_ingest(standings_file.getvalue(), salaries_file.getvalue())
+    _store_result(summary)
+    st.success("Contest ingested successfully", icon="✅")
 
 
 def _render_metrics(entries: pd.DataFrame, contest_meta: pd.DataFrame) -> None:
@@ -117,7 +251,8 @@ def _render_metrics(entries: pd.DataFrame, contest_meta: pd.DataFrame) -> None:
         col4.metric("Ingested", contest_meta.iloc[0]["ingest_time"])
 
 
-def _user_lineups(entries: pd.DataFrame, username: str) -> pd.DataFrame:
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: lambda _: 0})
+def _user_lineups(entries: pd.DataFrame, username: str, cache_key: str) -> pd.DataFrame:
     subset = entries.loc[entries["username"] == username].copy()
     if subset.empty:
         return subset
@@ -133,23 +268,49 @@ def _user_lineups(entries: pd.DataFrame, username: str) -> pd.DataFrame:
     ]].sort_values("rank")
 
 
+def _get_combo_table(size: int) -> pd.DataFrame:
+    return _table(f"Combos{size}")
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.DataFrame: lambda _: 0})
+def _filtered_user_exposure(
+    entries: pd.DataFrame,
+    exploded: pd.DataFrame,
+    field_players: pd.DataFrame,
+    cache_key: str,
+) -> pd.DataFrame:
+    if entries.empty:
+        return pd.DataFrame()
+    return aggregate.compute_user_exposure(entries, exploded, field_players)
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs={pd.Series: lambda _: 0, np.ndarray: lambda _: 0})
 def _user_combos(
-    username: str,
-    combos: Dict[int, pd.DataFrame],
-    entry_user_map: Dict[int, str],
-    entry_ids: Iterable[int],
+    user_code: int,
+    entry_user_codes: pd.Series,
+    entry_ids: np.ndarray,
     top_n: int,
+    entry_positions: pd.Series,
+    n_entries: int,
+    cache_token: str,
+    view_token: str,
 ) -> pd.DataFrame:
-    user_ids = {eid for eid in entry_ids if entry_user_map.get(eid) == username}
-    if not user_ids:
+    # `entry_ids`/`entry_positions` are excluded from hashing; `view_token`
+    # (contest + filter selection) is what actually determines them.
+    user_mask = entry_user_codes.reindex(entry_ids, fill_value=-1).to_numpy() == user_code
+    user_ids = entry_ids[user_mask]
+    if not user_ids.size:
         return pd.DataFrame()
+    user_bits = aggregate.bitset_from_entry_ids(user_ids, entry_positions, n_entries)
     frames: List[pd.DataFrame] = []
-    for frame in combos.values():
+    for size in (2, 3, 4):
+        frame = _get_combo_table(size)
         if frame.empty:
             continue
+        combo_bits = _combo_bitsets(f"Combos{size}", cache_token)
         filtered = frame.copy()
-        filtered["count_in_current_percentile"] = filtered["entry_ids"].apply(
-            lambda ids: int(sum(1 for value in (ids or []) if value in user_ids))
+        filtered["count_in_current_percentile"] = aggregate.popcount_intersection(
+            combo_bits[filtered.index.to_numpy()], user_bits
         )
         filtered = filtered[filtered["count_in_current_percentile"] > 0]
         frames.append(filtered)
@@ -179,33 +340,49 @@ def main() -> None:
         if output_dir:
             st.info(f"Latest output stored in `{output_dir}`")
 
-    tables: Dict[str, pd.DataFrame] | None = st.session_state.get("contest_tables")
-    if not tables:
+    table_paths: Dict[str, str] | None = st.session_state.get("contest_table_paths")
+    if not table_paths:
         st.info("Load the sample data or upload a contest to begin.")
         return
 
-    entries = tables["Entries"].copy()
-    entries_exploded = tables["EntriesExploded"].copy()
-    field_players = tables.get("FieldPlayers", pd.DataFrame()).copy()
-    contest_meta = tables.get("ContestMeta", pd.DataFrame()).copy()
+    entries = _table("Entries")
+    entries_exploded = _table("EntriesExploded")
+    field_players = _table("FieldPlayers")
+    contest_meta = _table("ContestMeta")
     unmatched_players = st.session_state.get("unmatched_players") or []
 
-    combos = {
-        size: tables.get(f"Combos{size}", pd.DataFrame()).copy()
-        for size in (2, 3, 4)
-    }
-    team_stacks = tables.get("TeamStacks", pd.DataFrame()).copy()
-    game_stacks = tables.get("GameStacks", pd.DataFrame()).copy()
-
     filter_selection: FilterSelection = render_percentile_rank_filters(len(entries))
-    filtered_entries = aggregate.apply_percentile_filter(entries, filter_selection.percentile, filter_selection.rank)
+    filter_mask = aggregate.percentile_filter_mask(entries, filter_selection.percentile, filter_selection.rank)
+    filtered_entries = entries if filter_mask.all() else entries.iloc[filter_mask]
     if filtered_entries.empty:
         st.warning("No entries match the current filter selection.")
-    filtered_entry_ids = [int(eid) for eid in filtered_entries["entry_id"].dropna().astype(int).tolist()]
-    filtered_exploded = entries_exploded[entries_exploded["entry_id"].isin(filtered_entry_ids)] if filtered_entry_ids else entries_exploded.head(0)
-    filtered_user_exposure = aggregate.compute_user_exposure(filtered_entries, filtered_exploded, field_players) if not filtered_entries.empty else pd.DataFrame()
-
-    entry_user_map = {int(row.entry_id): row.username for row in entries.itertuples(index=False) if not pd.isna(row.entry_id)}
+    filtered_entry_ids = entries["entry_id"].to_numpy(dtype=np.int64, na_value=-1)[filter_mask]
+    filtered_entry_ids = filtered_entry_ids[filtered_entry_ids >= 0]
+    if filter_mask.all():
+        filtered_exploded = entries_exploded
+    elif not filtered_entry_ids.size:
+        filtered_exploded = entries_exploded.head(0)
+    elif filtered_entry_ids.size <= len(entries) // 2:
+        # Selective filters slice the entry_id-sorted table in O(k log n)
+        # instead of scanning every exploded row with isin.
+        filtered_exploded = aggregate.take_sorted_rows(
+            _exploded_by_entry(table_paths["EntriesExploded"]), filtered_entry_ids
+        ).reset_index(drop=True)
+    else:
+        filtered_exploded = entries_exploded[entries_exploded["entry_id"].isin(filtered_entry_ids)]
+    entry_positions = _entry_positions(entries)
+    filter_bits = aggregate.bitset_from_entry_ids(filtered_entry_ids, entry_positions, len(entries))
+    has_filter = bool(filtered_entry_ids.size)
+    bitset_token = st.session_state.get("contest_output_dir") or ""
+    view_token = f"{bitset_token}:{filter_selection.percentile}:{filter_selection.rank}"
+    filtered_user_exposure = _filtered_user_exposure(filtered_entries, filtered_exploded, field_players, view_token)
+
+    # entry_id -> username category code, as a reindexable Series so per-user
+    # filtering stays a vectorized NumPy equality instead of dict lookups.
+    entry_user_codes = pd.Series(
+        entries["username"].cat.codes.to_numpy(),
+        index=pd.Index(entries["entry_id"].to_numpy(dtype=np.int64, na_value=-1)),
+    )
 
     tabs = st.tabs(["Overview", "Users", "Combos", "Field"])
 
@@ -231,16 +408,21 @@ def main() -> None:
     with tabs[1]:
         st.subheader("User Explorer")
         user_search = st.text_input("Search users", value="", placeholder="Start typing a username")
-        user_options = sorted(entries["username"].dropna().unique().tolist())
+        user_index = _user_search_index(table_paths["Entries"])
+        user_options = user_index["username"].tolist()
         if not user_options:
             st.info("No users available in this contest.")
         else:
-            filtered_users = [user for user in user_options if user_search.lower() in user.lower()]
+            if user_search:
+                search_mask = user_index["username_lower"].str.contains(user_search.lower(), regex=False, na=False)
+                filtered_users = user_index.loc[search_mask, "username"].tolist()
+            else:
+                filtered_users = user_options
             options = filtered_users or user_options
             selected_user = st.selectbox("Select user", options, index=0)
             top_n_user = st.slider("Top combos to show", min_value=10, max_value=500, value=100, step=10, key="user_combo_cap")
             if selected_user:
-                user_lineups = _user_lineups(filtered_entries, selected_user)
+                user_lineups = _user_lineups(filtered_entries, selected_user, view_token)
                 st.markdown(f"**Lineups for {selected_user} ({len(user_lineups)} shown)**")
                 st.dataframe(user_lineups, use_container_width=True)
                 user_exposure = filtered_user_exposure.loc[filtered_user_exposure["username"] == selected_user]
@@ -259,7 +441,16 @@ def main() -> None:
                         ]].sort_values("user_exposure_pct", ascending=False),
                         use_container_width=True,
                     )
-                user_combos = _user_combos(selected_user, combos, entry_user_map, filtered_entry_ids, top_n_user)
+                user_combos = _user_combos(
+                    int(entries["username"].cat.categories.get_loc(selected_user)),
+                    entry_user_codes,
+                    filtered_entry_ids,
+                    top_n_user,
+                    entry_positions,
+                    len(entries),
+                    bitset_token,
+                    view_token,
+                )
                 if not user_combos.empty:
                     st.markdown("**User Combos in View**")
                     st.dataframe(user_combos.drop(columns=["entry_ids"], errors="ignore"), use_container_width=True)
@@ -268,25 +459,34 @@ def main() -> None:
         st.subheader("Combos & Stacks")
         combo_type = st.selectbox("View", ["Name Combos", "Team Stacks", "Game Stacks"], key="combo_type")
         top_n = st.slider("Top rows", min_value=50, max_value=5000, value=500, step=50, key="combo_cap")
+        # Only the selected table is read; the other combo/stack Parquet
+        # files stay on disk.
         if combo_type == "Name Combos":
             size = st.selectbox("Combo size", [2, 3, 4], index=0, key="combo_size")
-            frame = combos.get(size, pd.DataFrame())
-            display = _combo_display(frame, filtered_entry_ids, top_n)
+            frame = _get_combo_table(size)
+            combo_bits = _combo_bitsets(f"Combos{size}", bitset_token)
         elif combo_type == "Team Stacks":
             size = st.selectbox("Stack size", [2, 3, 4], index=0, key="team_stack_size")
+            team_stacks = _table("TeamStacks")
             frame = team_stacks.loc[team_stacks["size"] == size] if not team_stacks.empty else pd.DataFrame()
-            display = _combo_display(frame, filtered_entry_ids, top_n)
+            combo_bits = _combo_bitsets("TeamStacks", bitset_token)
         else:
             size = st.selectbox("Stack size", [2, 3, 4, 5, 6, 7], index=0, key="game_stack_size")
+            game_stacks = _table("GameStacks")
             frame = game_stacks.loc[game_stacks["size"] == size] if not game_stacks.empty else pd.DataFrame()
-            display = _combo_display(frame, filtered_entry_ids, top_n)
+            combo_bits = _combo_bitsets("GameStacks", bitset_token)
+        display = _combo_display(frame, combo_bits, filter_bits, has_filter, top_n, f"{view_token}:{combo_type}:{size}")
         if display.empty:
             st.info("No combos available for the current selection.")
         else:
             st.dataframe(display.drop(columns=["entry_ids"], errors="ignore"), use_container_width=True)
+            export_key = (
+                f"{bitset_token}:{combo_type}:{size}:{top_n}:"
+                f"{filter_selection.percentile}:{filter_selection.rank}"
+            )
             st.download_button(
                 "Download CSV",
-                data=_downloadable_csv(display),
+                data=_downloadable_csv(display, export_key),
                 file_name=f"{combo_type.replace(' ', '_').lower()}_{size}.csv",
                 mime="text/csv",
             )
@@ -297,15 +497,16 @@ def main() -> None:
             st.info("Field ownership table not available in this contest export.")
         else:
             player_search = st.text_input("Search players", value="", key="field_search", placeholder="Player name")
-            field_view = field_players.copy()
+            field_view = field_players
             if player_search:
-                mask = field_view["player"].str.contains(player_search, case=False, na=False)
+                player_lower = _lowered_column(table_paths["FieldPlayers"], "player")
+                mask = player_lower.str.contains(player_search.lower(), regex=False, na=False)
                 field_view = field_view[mask]
             field_view = field_view.sort_values("field_pct", ascending=False)
             st.dataframe(field_view, use_container_width=True)
             st.download_button(
                 "Download Field CSV",
-                data=_downloadable_csv(field_view),
+                data=_downloadable_csv(field_view, f"{bitset_token}:field:{player_search}"),
                 file_name="field_players.csv",
                 mime="text/csv",
             )
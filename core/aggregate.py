@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from itertools import combinations
-from statistics import median
-from typing import Dict, List, Sequence
+from typing import Dict, List
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
-from .util import percentile_from_rank
+from . import kernels
+from .util import percentile_from_rank_array
 
 
 @dataclass
@@ -21,9 +24,11 @@ class ComboConfig:
 
 
 def compute_user_exposure(entries: pd.DataFrame, exploded: pd.DataFrame, field_players: pd.DataFrame) -> pd.DataFrame:
-    user_lineups = entries.groupby("username")[["entry_id"]].nunique().rename(columns={"entry_id": "user_total_lineups"})
+    # Entries are unique per entry_id, so a plain value_counts over usernames
+    # gives each user's lineup count in one pass.
+    user_lineups = entries["username"].value_counts().rename("user_total_lineups")
     exposure = (
-        exploded.groupby(["username", "player"])  # type: ignore[arg-type]
+        exploded.groupby(["username", "player"], observed=True)  # type: ignore[arg-type]
         .agg(
             entry_count=("entry_id", "nunique"),
             best_rank=("rank", "min"),
@@ -32,7 +37,7 @@ def compute_user_exposure(entries: pd.DataFrame, exploded: pd.DataFrame, field_p
         )
         .reset_index()
     )
-    exposure = exposure.merge(user_lineups, on="username", how="left")
+    exposure = exposure.merge(user_lineups, left_on="username", right_index=True, how="left")
     exposure["user_exposure_pct"] = (
         exposure["entry_count"] / exposure["user_total_lineups"].replace({0: pd.NA}) * 100
     ).astype(float)
@@ -42,183 +47,369 @@ def compute_user_exposure(entries: pd.DataFrame, exploded: pd.DataFrame, field_p
     return exposure.sort_values(["username", "player"]).reset_index(drop=True)
 
 
-def _combo_records(entries: pd.DataFrame, size: int) -> List[dict]:
-    records: Dict[tuple[str, ...], Dict[str, List[float]]] = defaultdict(lambda: {
-        "entry_ids": [],
-        "ranks": [],
-        "percentiles": [],
-        "points": [],
-    })
-    for row in entries.itertuples(index=False):
-        players: Sequence[str] = getattr(row, "lineup_players", [])
-        if not players or len(players) < size:
-            continue
-        unique_players = sorted(dict.fromkeys(players))
-        for combo in combinations(unique_players, size):
-            bucket = records[combo]
-            bucket["entry_ids"].append(getattr(row, "entry_id"))
-            bucket["ranks"].append(getattr(row, "rank"))
-            bucket["percentiles"].append(getattr(row, "percentile"))
-            bucket["points"].append(getattr(row, "points"))
-    return _combo_dict_to_records(records, size=size)
-
-
-def _combo_dict_to_records(records: Dict[tuple[str, ...], Dict[str, List[float]]], *, size: int, extra: dict | None = None) -> List[dict]:
-    output: List[dict] = []
-    for combo, payload in records.items():
-        ranks = payload["ranks"]
-        percentiles = payload["percentiles"]
-        points = payload["points"]
-        entry_ids = payload["entry_ids"]
-        if not entry_ids:
-            continue
-        extra_payload = extra or {}
-        output.append(
-            {
-                "combo": " | ".join(combo),
-                "players": list(combo),
-                "size": size,
-                "frequency": len(entry_ids),
-                "best_rank": min(ranks),
-                "best_percentile": min(percentiles),
-                "median_rank": float(median(ranks)),
-                "max_points": max(points),
-                "entry_ids": entry_ids,
-                "count_in_current_percentile": len(entry_ids),
-                **extra_payload,
-            }
+_COMBO_COLUMNS = [
+    "combo",
+    "players",
+    "size",
+    "frequency",
+    "best_rank",
+    "best_percentile",
+    "median_rank",
+    "max_points",
+    "entry_ids",
+    "count_in_current_percentile",
+]
+
+
+def _encode_lineups(entries: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, pd.Index]:
+    """Integer-code the deduped, sorted players of each entry.
+
+    Returns a -1-padded int16[N, max_len] code matrix, per-row player counts,
+    and the shared category index used to decode codes back to names.
+    """
+    unique_lists = [sorted(dict.fromkeys(players)) for players in entries["lineup_players"]]
+    lens = np.fromiter((len(players) for players in unique_lists), dtype=np.int64, count=len(unique_lists))
+    flat = pd.Categorical([player for players in unique_lists for player in players])
+    max_len = int(lens.max()) if len(lens) else 0
+    players_mat = np.full((len(unique_lists), max_len), -1, dtype=np.int16)
+    codes = flat.codes.astype(np.int16)
+    offsets = np.concatenate(([0], np.cumsum(lens)))
+    for i in range(len(unique_lists)):
+        players_mat[i, : lens[i]] = codes[offsets[i] : offsets[i + 1]]
+    return players_mat, lens, flat.categories
+
+
+def _enumerate_combo_hits(players_mat: np.ndarray, lens: np.ndarray, size: int):
+    """Run the enumeration kernel; returns (keys, rows) or None if no combos."""
+    counts = kernels.combos_per_row(lens, size)
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    keys = np.empty(total, dtype=np.int64)
+    rows = np.empty(total, dtype=np.int32)
+    kernels.enumerate_combo_keys(players_mat, lens, offsets, size, keys, rows)
+    return keys, rows
+
+
+def _combo_records(entries: pd.DataFrame, size: int) -> pd.DataFrame:
+    if entries.empty:
+        return pd.DataFrame(columns=_COMBO_COLUMNS)
+    players_mat, lens, categories = _encode_lineups(entries)
+    hit = _enumerate_combo_hits(players_mat, lens, size)
+    if hit is None:
+        return pd.DataFrame(columns=_COMBO_COLUMNS)
+    return _combo_frame(entries, size, categories, *hit)
+
+
+def _combo_frame(
+    entries: pd.DataFrame,
+    size: int,
+    categories: pd.Index,
+    keys: np.ndarray,
+    rows: np.ndarray,
+) -> pd.DataFrame:
+    entry_ids = entries["entry_id"].to_numpy(dtype="int64", na_value=-1)[rows]
+    ranks = entries["rank"].to_numpy(dtype="int64", na_value=np.iinfo(np.int64).max)[rows]
+    percentiles = entries["percentile"].to_numpy(dtype="float64")[rows]
+    points = entries["points"].to_numpy(dtype="float64")[rows]
+
+    agg = _reduce_combo_hits(keys, entry_ids, ranks, percentiles, points)
+    combo_codes = kernels.unpack_combo_keys(agg["combo_id"], size)
+    names = categories.to_numpy()[combo_codes]
+    frame = pd.DataFrame(
+        {
+            "combo": [" | ".join(row) for row in names],
+            "players": names.tolist(),
+            "size": size,
+            "frequency": agg["frequency"],
+            "best_rank": agg["best_rank"],
+            "best_percentile": agg["best_percentile"],
+            "median_rank": agg["median_rank"],
+            "max_points": agg["max_points"],
+            "entry_ids": agg["entry_ids"],
+        }
+    )
+    frame["count_in_current_percentile"] = frame["frequency"]
+    return frame.loc[:, _COMBO_COLUMNS]
+
+
+def _reduce_combo_hits(
+    combo_ids: np.ndarray,
+    entry_ids: np.ndarray,
+    ranks: np.ndarray,
+    percentiles: np.ndarray,
+    points: np.ndarray,
+) -> Dict[str, object]:
+    """Aggregate flat hit arrays per combo id with sort + segmented reductions.
+
+    Hits are sorted by (combo_id, rank) so every combo is a contiguous segment
+    whose ranks are pre-sorted; min/max/median/frequency then fall out of
+    `reduceat` and midpoint picks without per-combo Python lists.
+    """
+    order = np.lexsort((ranks, combo_ids))
+    ids_sorted = combo_ids[order]
+    ranks_sorted = ranks[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ids_sorted)) + 1))
+    ends = np.concatenate((starts[1:], [len(ids_sorted)]))
+    lo = (starts + ends - 1) // 2
+    hi = (starts + ends) // 2
+    return {
+        "combo_id": ids_sorted[starts],
+        "frequency": ends - starts,
+        "best_rank": ranks_sorted[starts],
+        "best_percentile": np.minimum.reduceat(percentiles[order], starts),
+        "median_rank": (ranks_sorted[lo] + ranks_sorted[hi]) / 2.0,
+        "max_points": np.maximum.reduceat(points[order], starts),
+        # The sorted hit order already groups entry ids per combo, so the
+        # Arrow list column is just (offsets, values) over the same buffer —
+        # no per-combo Python lists.
+        "entry_ids": pd.arrays.ArrowExtensionArray(
+            pa.ListArray.from_arrays(np.append(starts, len(ids_sorted)).astype(np.int32), entry_ids[order])
+        ),
+    }
+
+
+class _ComboHits:
+    """Flat SoA accumulator for combo hits, keyed by an interned bucket id."""
+
+    def __init__(self) -> None:
+        self._bucket_index: Dict[tuple, int] = {}
+        self.bucket_keys: List[tuple] = []
+        self.combo_ids: List[int] = []
+        self.entry_ids: List[int] = []
+        self.ranks: List[int] = []
+        self.percentiles: List[float] = []
+        self.points: List[float] = []
+
+    def add(self, key: tuple, entry_id: int, rank: int, percentile: float, points: float) -> None:
+        idx = self._bucket_index.get(key)
+        if idx is None:
+            idx = self._bucket_index[key] = len(self.bucket_keys)
+            self.bucket_keys.append(key)
+        self.combo_ids.append(idx)
+        self.entry_ids.append(entry_id)
+        self.ranks.append(rank)
+        self.percentiles.append(percentile)
+        self.points.append(points)
+
+    def reduce(self) -> Dict[str, object]:
+        return _reduce_combo_hits(
+            np.asarray(self.combo_ids, dtype=np.int64),
+            np.asarray(self.entry_ids, dtype=np.int64),
+            np.asarray(self.ranks, dtype=np.int64),
+            np.asarray(self.percentiles, dtype=np.float64),
+            np.asarray(self.points, dtype=np.float64),
         )
-    return output
 
 
 def compute_name_combos(entries: pd.DataFrame, config: ComboConfig) -> Dict[int, pd.DataFrame]:
+    # Enumeration stays on the calling thread: the kernel already fans out
+    # across cores and numba's default workqueue threading layer must not be
+    # entered from several Python threads. The per-size pandas reductions are
+    # independent, so those overlap on a small pool.
+    sizes = list(range(config.min_size, config.max_size + 1))
     results: Dict[int, pd.DataFrame] = {}
-    for size in range(config.min_size, config.max_size + 1):
-        records = _combo_records(entries, size=size)
-        frame = pd.DataFrame.from_records(records)
+    # Dedup/sort/integer-code each lineup once; the per-size passes share the
+    # encoded matrix instead of redoing the encoding three times.
+    encoded = _encode_lineups(entries) if not entries.empty else None
+    with ThreadPoolExecutor(max_workers=len(sizes)) as pool:
+        futures = {}
+        for size in sizes:
+            hit = None
+            if encoded is not None:
+                players_mat, lens, categories = encoded
+                hit = _enumerate_combo_hits(players_mat, lens, size)
+            if hit is not None:
+                futures[size] = pool.submit(_combo_frame, entries, size, categories, *hit)
+        frames = {
+            size: futures[size].result() if size in futures else pd.DataFrame(columns=_COMBO_COLUMNS)
+            for size in sizes
+        }
+    for size in sizes:
+        frame = frames[size]
         if not frame.empty:
             frame = frame.sort_values(["size", "frequency", "best_rank"], ascending=[True, False, True])
         results[size] = frame.reset_index(drop=True)
     return results
 
 
+def _stack_frame(hits: _ComboHits, group_column: str) -> pd.DataFrame:
+    if not hits.combo_ids:
+        return pd.DataFrame()
+    agg = hits.reduce()
+    keys = [hits.bucket_keys[combo_id] for combo_id in agg["combo_id"]]
+    frame = pd.DataFrame(
+        {
+            group_column: [group for group, _ in keys],
+            "combo": [" | ".join(combo) for _, combo in keys],
+            "players": [list(combo) for _, combo in keys],
+            "size": [len(combo) for _, combo in keys],
+            "frequency": agg["frequency"],
+            "best_rank": agg["best_rank"],
+            "best_percentile": agg["best_percentile"],
+            "median_rank": agg["median_rank"],
+            "max_points": agg["max_points"],
+            "entry_ids": agg["entry_ids"],
+        }
+    )
+    frame["count_in_current_percentile"] = frame["frequency"]
+    return frame.sort_values([group_column, "frequency", "best_rank"], ascending=[True, False, True]).reset_index(drop=True)
+
+
+def _stack_hits(exploded: pd.DataFrame, group_column: str, min_size: int, max_size: int) -> _ComboHits:
+    """Enumerate same-group stacks by walking contiguous segments of one sort.
+
+    Sorting once by (entry_id, group, player) replaces the per-entry dict of
+    groupby frames: every entry is a slice of the sorted arrays and every
+    group within it a sub-slice, so no tiny DataFrames get materialized.
+    """
+    hits = _ComboHits()
+    subset = exploded.dropna(subset=[group_column])
+    if subset.empty:
+        return hits
+    subset = subset.sort_values(["entry_id", group_column, "player"], kind="stable")
+    entry_ids = subset["entry_id"].to_numpy(dtype="int64", na_value=-1)
+    groups = subset[group_column].to_numpy()
+    players = subset["player"].to_numpy()
+    ranks = subset["rank"].to_numpy(dtype="int64", na_value=np.iinfo(np.int64).max)
+    percentiles = subset["percentile"].to_numpy(dtype="float64")
+    points = subset["points"].to_numpy(dtype="float64")
+
+    _, entry_starts = np.unique(entry_ids, return_index=True)
+    entry_bounds = np.append(entry_starts, len(entry_ids))
+    for start, end in zip(entry_bounds[:-1], entry_bounds[1:]):
+        entry_id = entry_ids[start]
+        rank = ranks[start]
+        percentile = percentiles[start]
+        entry_points = points[start]
+        group_values, group_starts = np.unique(groups[start:end], return_index=True)
+        group_bounds = np.append(group_starts, end - start)
+        for index, group in enumerate(group_values):
+            segment = players[start + group_bounds[index] : start + group_bounds[index + 1]]
+            unique_players = np.unique(segment).tolist()
+            limit = min(len(unique_players), max_size)
+            for size in range(min_size, limit + 1):
+                for combo in combinations(unique_players, size):
+                    hits.add((group, combo), entry_id, rank, percentile, entry_points)
+    return hits
+
+
 def compute_team_stacks(entries: pd.DataFrame, exploded: pd.DataFrame, config: ComboConfig) -> pd.DataFrame:
-    lookup = {entry_id: group for entry_id, group in exploded.groupby("entry_id")}
-    records: Dict[tuple[str, tuple[str, ...]], Dict[str, List[float]]] = defaultdict(lambda: {
-        "entry_ids": [],
-        "ranks": [],
-        "percentiles": [],
-        "points": [],
-    })
-    for row in entries.itertuples(index=False):
-        entry_id = getattr(row, "entry_id")
-        group = lookup.get(entry_id)
-        if group is None:
-            continue
-        by_team = group.dropna(subset=["team"]).groupby("team")
-        for team, team_group in by_team:
-            players = sorted(team_group["player"].unique())
-            limit = min(len(players), config.team_stack_max)
-            for size in range(config.min_size, limit + 1):
-                for combo in combinations(players, size):
-                    bucket = records[(team, combo)]
-                    bucket["entry_ids"].append(entry_id)
-                    bucket["ranks"].append(getattr(row, "rank"))
-                    bucket["percentiles"].append(getattr(row, "percentile"))
-                    bucket["points"].append(getattr(row, "points"))
-    rows = []
-    for (team, combo), payload in records.items():
-        ranks = payload["ranks"]
-        percentiles = payload["percentiles"]
-        points = payload["points"]
-        entry_ids = payload["entry_ids"]
-        if not entry_ids:
-            continue
-        rows.append(
-            {
-                "team": team,
-                "combo": " | ".join(combo),
-                "players": list(combo),
-                "size": len(combo),
-                "frequency": len(entry_ids),
-                "best_rank": min(ranks),
-                "best_percentile": min(percentiles),
-                "median_rank": float(median(ranks)),
-                "max_points": max(points),
-                "entry_ids": entry_ids,
-                "count_in_current_percentile": len(entry_ids),
-            }
-        )
-    frame = pd.DataFrame(rows)
-    if frame.empty:
-        return frame
-    return frame.sort_values(["team", "frequency", "best_rank"], ascending=[True, False, True]).reset_index(drop=True)
+    hits = _stack_hits(exploded, "team", config.min_size, config.team_stack_max)
+    return _stack_frame(hits, "team")
 
 
 def compute_game_stacks(entries: pd.DataFrame, exploded: pd.DataFrame, config: ComboConfig) -> pd.DataFrame:
-    lookup = {entry_id: group for entry_id, group in exploded.groupby("entry_id")}
-    records: Dict[tuple[str, tuple[str, ...]], Dict[str, List[float]]] = defaultdict(lambda: {
-        "entry_ids": [],
-        "ranks": [],
-        "percentiles": [],
-        "points": [],
-    })
-    for row in entries.itertuples(index=False):
-        entry_id = getattr(row, "entry_id")
-        group = lookup.get(entry_id)
-        if group is None:
-            continue
-        by_game = group.dropna(subset=["game_id"]).groupby("game_id")
-        for game_id, game_group in by_game:
-            players = sorted(game_group["player"].unique())
-            limit = min(len(players), config.game_stack_max)
-            for size in range(config.min_size, limit + 1):
-                for combo in combinations(players, size):
-                    bucket = records[(game_id, combo)]
-                    bucket["entry_ids"].append(entry_id)
-                    bucket["ranks"].append(getattr(row, "rank"))
-                    bucket["percentiles"].append(getattr(row, "percentile"))
-                    bucket["points"].append(getattr(row, "points"))
-    rows = []
-    for (game_id, combo), payload in records.items():
-        ranks = payload["ranks"]
-        percentiles = payload["percentiles"]
-        points = payload["points"]
-        entry_ids = payload["entry_ids"]
-        if not entry_ids:
-            continue
-        rows.append(
-            {
-                "game_id": game_id,
-                "combo": " | ".join(combo),
-                "players": list(combo),
-                "size": len(combo),
-                "frequency": len(entry_ids),
-                "best_rank": min(ranks),
-                "best_percentile": min(percentiles),
-                "median_rank": float(median(ranks)),
-                "max_points": max(points),
-                "entry_ids": entry_ids,
-                "count_in_current_percentile": len(entry_ids),
-            }
-        )
-    frame = pd.DataFrame(rows)
-    if frame.empty:
-        return frame
-    return frame.sort_values(["game_id", "frequency", "best_rank"], ascending=[True, False, True]).reset_index(drop=True)
+    hits = _stack_hits(exploded, "game_id", config.min_size, config.game_stack_max)
+    return _stack_frame(hits, "game_id")
 
 
-def apply_percentile_filter(entries: pd.DataFrame, percentile: float | None, rank: int | None) -> pd.DataFrame:
-    frame = entries
+def bitset_from_positions(positions: np.ndarray, n_entries: int) -> np.ndarray:
+    """Pack entry positions (0..n_entries-1) into a uint64 bitset."""
+    n_words = (n_entries + 63) // 64
+    bits = np.zeros(n_words, dtype=np.uint64)
+    if positions.size:
+        bits_to_set = np.uint64(1) << (positions % 64).astype(np.uint64)
+        np.bitwise_or.at(bits, positions // 64, bits_to_set)
+    return bits
+
+
+def bitset_from_entry_ids(entry_ids: np.ndarray, entry_positions: pd.Series, n_entries: int) -> np.ndarray:
+    positions = entry_positions.reindex(np.asarray(entry_ids, dtype=np.int64), fill_value=-1).to_numpy(dtype=np.int64)
+    return bitset_from_positions(positions[positions >= 0], n_entries)
+
+
+def _list_column_parts(column: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Per-row lengths and flattened int64 values of a list column.
+
+    Arrow-backed columns expose both directly from the (offsets, values)
+    layout; object columns of Python/numpy lists fall back to a concat.
+    """
+    if isinstance(column.dtype, pd.ArrowDtype):
+        arr = column.array._pa_array.combine_chunks()
+        lens = pc.list_value_length(arr).to_numpy(zero_copy_only=False).astype(np.int64)
+        flat = pc.list_flatten(arr).to_numpy(zero_copy_only=False).astype(np.int64)
+        return lens, flat
+    lens = np.fromiter((len(ids) for ids in column), dtype=np.int64, count=len(column))
+    if not lens.sum():
+        return lens, np.empty(0, dtype=np.int64)
+    flat = np.concatenate([np.asarray(ids, dtype=np.int64) for ids in column if len(ids)])
+    return lens, flat
+
+
+def build_entry_bitsets(entry_ids_lists: pd.Series, entry_positions: pd.Series, n_entries: int) -> np.ndarray:
+    """Pack each row's entry-id list into one row of a uint64 bitset matrix."""
+    n_words = (n_entries + 63) // 64
+    lens, flat = _list_column_parts(entry_ids_lists)
+    bits = np.zeros((len(lens), n_words), dtype=np.uint64)
+    total = int(lens.sum())
+    if total == 0:
+        return bits
+    rows = np.repeat(np.arange(len(lens), dtype=np.int64), lens)
+    positions = entry_positions.reindex(flat, fill_value=-1).to_numpy(dtype=np.int64)
+    valid = positions >= 0
+    rows = rows[valid]
+    positions = positions[valid]
+    np.bitwise_or.at(bits, (rows, positions // 64), np.uint64(1) << (positions % 64).astype(np.uint64))
+    return bits
+
+
+def popcount_intersection(combo_bits: np.ndarray, filter_bits: np.ndarray) -> np.ndarray:
+    """Count set bits of `combo_bits & filter_bits` per row, 64 bits at a time."""
+    return np.bitwise_count(combo_bits & filter_bits[None, :]).sum(axis=1, dtype=np.int64)
+
+
+def take_sorted_rows(frame: pd.DataFrame, keys: np.ndarray) -> pd.DataFrame:
+    """Select rows of a frame with a sorted key index via searchsorted slices.
+
+    O(k log n) for k keys instead of an O(n) isin scan; keys missing from the
+    index contribute nothing.
+    """
+    index = frame.index
+    left = index.searchsorted(keys, side="left")
+    right = index.searchsorted(keys, side="right")
+    counts = right - left
+    total = int(counts.sum())
+    if total == 0:
+        return frame.head(0)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(left, counts) + offsets
+    return frame.iloc[positions]
+
+
+def percentile_filter_mask(entries: pd.DataFrame, percentile: float | None, rank: int | None) -> np.ndarray:
+    """Boolean mask over `entries` rows for the percentile/rank selection.
+
+    Returning the mask (rather than a filtered copy) lets callers reuse it
+    across the entries, entry-id, and exploded projections without
+    materializing intermediates.
+    """
+    # Full-range selectors keep every row; skip the column scans entirely.
+    if percentile is not None and percentile >= 100.0:
+        percentile = None
+    if rank is not None and rank >= len(entries):
+        rank = None
+    mask = np.ones(len(entries), dtype=bool)
     if percentile is not None:
-        frame = frame.loc[frame["percentile"] <= percentile]
+        mask &= entries["percentile"].to_numpy() <= percentile
     if rank is not None:
-        frame = frame.loc[frame["rank"] <= rank]
-    return frame
+        mask &= entries["rank"].to_numpy(dtype="int64", na_value=np.iinfo(np.int64).max) <= rank
+    return mask
+
+
+def apply_percentile_filter(entries: pd.DataFrame, percentile: float | None, rank: int | None) -> pd.DataFrame:
+    if (percentile is None or percentile >= 100.0) and (rank is None or rank >= len(entries)):
+        return entries
+    mask = percentile_filter_mask(entries, percentile, rank)
+    if mask.all():
+        return entries
+    return entries.iloc[mask]
 
 
 def enrich_with_percentiles(entries: pd.DataFrame) -> pd.DataFrame:
     total = len(entries)
     entries = entries.copy()
-    entries["percentile"] = [percentile_from_rank(r, total) for r in entries["rank"]]
+    ranks = entries["rank"].to_numpy(dtype="float64", na_value=np.nan)
+    entries["percentile"] = percentile_from_rank_array(ranks, total)
     return entries
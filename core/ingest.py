@@ -1,21 +1,20 @@
 from __future__ import annotations
 
-import math
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from statistics import mean
-from typing import Dict, List, Optional
+from typing import IO, Dict, List, Union
 
+import numpy as np
 import pandas as pd
 
 from . import aggregate
 from .util import (
-    GameInfo,
+    GAME_INFO_RE,
     comparable_name,
     normalize_player_name,
-    parse_game_info,
     short_hash,
     utc_timestamp,
 )
@@ -23,6 +22,11 @@ from .util import (
 LINEUP_SLOTS = ["PG", "SG", "SF", "PF", "C", "G", "F", "UTIL"]
 LINEUP_SLOT_SET = set(LINEUP_SLOTS)
 ENTRY_PATTERN = re.compile(r"^(?P<username>.+?)(?:\s*\((?P<used>\d+)(?:\s*/\s*(?P<max>\d+))?\))?$")
+# Slots are whole whitespace-delimited tokens (lookarounds, not \b, so the
+# single-letter slots C/G/F never match inside initials like "C.J.").
+LINEUP_SPLIT_RE = re.compile(
+    r"(?:(?<=\s)|^)(" + "|".join(LINEUP_SLOTS) + r")(?=\s|$)", re.IGNORECASE
+)
 
 
 @dataclass
@@ -48,38 +52,32 @@ def parse_entry_name(value: str) -> dict:
     return {"username": username, "entries_used": used_int, "entries_max": max_int}
 
 
-def parse_lineup(value: str) -> List[tuple[str, str]]:
+def parse_lineup(value: str) -> tuple[List[str], List[str]]:
+    """Parse a raw lineup string into parallel (slots, players) lists."""
     if not isinstance(value, str):
-        return []
-    tokens = value.replace("\n", " ").split()
-    results: List[tuple[str, str]] = []
-    current_slot: Optional[str] = None
-    current_tokens: List[str] = []
-    for token in tokens:
-        slot = token.upper()
-        if slot in LINEUP_SLOT_SET:
-            if current_slot and current_tokens:
-                name = normalize_player_name(" ".join(current_tokens))
-                if name:
-                    results.append((current_slot, name))
-            current_slot = slot
-            current_tokens = []
-        else:
-            current_tokens.append(token)
-    if current_slot and current_tokens:
-        name = normalize_player_name(" ".join(current_tokens))
+        return [], []
+    # One precompiled split: parts alternate [junk, slot, name, slot, name...].
+    parts = LINEUP_SPLIT_RE.split(value.replace("\n", " "))
+    slots: List[str] = []
+    players: List[str] = []
+    for slot, raw_name in zip(parts[1::2], parts[2::2]):
+        name = normalize_player_name(raw_name)
         if name:
-            results.append((current_slot, name))
-    return results
+            slots.append(slot.upper())
+            players.append(name)
+    return slots, players
+
 
+CsvSource = Union[Path, IO[bytes]]
 
-def _load_csv(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path, na_values=["", " ", "NA", "N/A"], keep_default_na=True)
+
+def _load_csv(source: CsvSource) -> pd.DataFrame:
+    return pd.read_csv(source, na_values=["", " ", "NA", "N/A"], keep_default_na=True)
 
 
 def ingest_contest(
-    standings_path: Path,
-    salaries_path: Path,
+    standings_path: CsvSource,
+    salaries_path: CsvSource,
     *,
     output_root: Path | None = None,
     sport: str = "nba",
@@ -93,22 +91,43 @@ def ingest_contest(
     entries_raw = entries_raw.drop_duplicates(subset=["EntryId"])
     field_raw = standings.loc[standings["Player"].notna()].copy()
 
-    entries_raw["Rank"] = pd.to_numeric(entries_raw["Rank"], errors="coerce")
+    # Final dtypes up front; the renamed frame reuses these columns as-is.
+    entries_raw["EntryId"] = pd.to_numeric(entries_raw["EntryId"], errors="coerce").astype("Int64")
+    entries_raw["Rank"] = pd.to_numeric(entries_raw["Rank"], errors="coerce").astype("Int64")
     entries_raw["Points"] = pd.to_numeric(entries_raw["Points"], errors="coerce")
 
-    parsed_names = entries_raw["EntryName"].apply(parse_entry_name)
-    entries_raw["username"] = parsed_names.apply(lambda d: d["username"])
-    entries_raw["entries_used"] = parsed_names.apply(lambda d: d["entries_used"])
-    entries_raw["entries_max"] = parsed_names.apply(lambda d: d["entries_max"])
-    entries_raw["username_lc"] = entries_raw["username"].str.lower().fillna("")
-
-    entries_raw["lineup_pairs"] = entries_raw["Lineup"].apply(parse_lineup)
-    entries_raw["lineup_players"] = entries_raw["lineup_pairs"].apply(lambda pairs: [player for _, player in pairs])
-    entries_raw["lineup_slots"] = entries_raw["lineup_pairs"].apply(lambda pairs: [slot for slot, _ in pairs])
-    entries_raw["canonical_lineup_key"] = entries_raw["lineup_players"].apply(lambda players: "|".join(sorted(players)))
-    entries_raw["canonical_hash"] = entries_raw["canonical_lineup_key"].apply(short_hash)
-    entries_raw["dupe_count"] = entries_raw.groupby("canonical_lineup_key")["EntryId"].transform("count")
-    entries_raw["user_total_lineups"] = entries_raw.groupby("username")["EntryId"].transform("nunique")
+    # One str.extract over the column instead of a Python regex per row;
+    # parse_entry_name stays for scalar callers and documents the fallbacks.
+    stripped_names = entries_raw["EntryName"].str.strip()
+    extracted = stripped_names.str.extract(ENTRY_PATTERN)
+    entries_raw["username"] = extracted["username"].str.strip().fillna(stripped_names).fillna("")
+    entries_raw["entries_used"] = pd.to_numeric(extracted["used"], errors="coerce").fillna(1).astype("int64")
+    entries_raw["entries_max"] = (
+        pd.to_numeric(extracted["max"], errors="coerce")
+        .fillna(entries_raw["entries_used"].clip(lower=1))
+        .astype("int64")
+    )
+    # username is guaranteed non-null by the fills above, so a plain list
+    # comprehension beats the StringMethods dispatch + fillna pass.
+    entries_raw["username_lc"] = [s.lower() for s in entries_raw["username"]]
+
+    # parse_lineup returns parallel lists, so the slot/player columns come
+    # straight out of one parse pass instead of re-iterating a pairs column.
+    parsed_lineups = entries_raw["Lineup"].map(parse_lineup)
+    entries_raw["lineup_slots"] = [slots for slots, _ in parsed_lineups]
+    entries_raw["lineup_players"] = [players for _, players in parsed_lineups]
+    entries_raw["canonical_lineup_key"] = ["|".join(sorted(players)) for players in entries_raw["lineup_players"]]
+    # Duplicated lineups share a key, so hash each distinct key once and
+    # broadcast instead of hashing every row.
+    canonical_keys = entries_raw["canonical_lineup_key"]
+    entries_raw["canonical_hash"] = canonical_keys.map(
+        {key: short_hash(key) for key in canonical_keys.unique()}
+    )
+    # Aggregate once per key and broadcast with joins; transform would walk
+    # the full frame for each derived column.
+    dupe_counts = entries_raw.groupby("canonical_lineup_key").size().rename("dupe_count")
+    user_totals = entries_raw.groupby("username")["EntryId"].nunique().rename("user_total_lineups")
+    entries_raw = entries_raw.join(dupe_counts, on="canonical_lineup_key").join(user_totals, on="username")
 
     entries = entries_raw.rename(
         columns={
@@ -131,7 +150,6 @@ def ingest_contest(
         "entries_max",
         "user_total_lineups",
         "lineup_raw",
-        "lineup_pairs",
         "lineup_players",
         "lineup_slots",
         "canonical_lineup_key",
@@ -139,11 +157,14 @@ def ingest_contest(
         "dupe_count",
     ]]
     entries = entries.rename(columns={"EntryName": "entry_name"})
-    entries["entry_id"] = pd.to_numeric(entries["entry_id"], errors="coerce").astype("Int64")
-    entries["rank"] = pd.to_numeric(entries["rank"], errors="coerce").astype("Int64")
-    entries["points"] = pd.to_numeric(entries["points"], errors="coerce")
 
-    entries = entries.sort_values("rank").reset_index(drop=True)
+    # Sort one integer array and reorder the frame in a single take; the
+    # frame carries list-typed object columns that make sort_values copies
+    # disproportionately expensive.
+    rank_order = np.argsort(
+        entries["rank"].to_numpy(dtype="int64", na_value=np.iinfo(np.int64).max), kind="stable"
+    )
+    entries = entries.iloc[rank_order].reset_index(drop=True)
     entries = aggregate.enrich_with_percentiles(entries)
 
     salaries = _load_csv(salaries_path)
@@ -152,109 +173,111 @@ def ingest_contest(
     salaries["Salary"] = pd.to_numeric(salaries["Salary"], errors="coerce")
     salaries["Game Info"] = salaries["Game Info"].fillna("")
 
-    game_infos: List[GameInfo] = salaries["Game Info"].apply(parse_game_info)
-    salaries["away_team"] = [info.away_team for info in game_infos]
-    salaries["home_team"] = [info.home_team for info in game_infos]
-    salaries["game_id"] = [info.game_id for info in game_infos]
-
-    salary_records = salaries.to_dict("records")
-    salary_lookup: Dict[str, dict] = {}
-    salary_lookup_secondary: Dict[str, dict] = {}
-    for record in salary_records:
-        name = record.get("Name")
-        if isinstance(name, str):
-            salary_lookup[name] = record
-            salary_lookup_secondary[comparable_name(name)] = record
-
-    exploded_rows: List[dict] = []
-    salary_sum: List[Optional[float]] = []
-    salary_avg: List[Optional[float]] = []
-    salary_min: List[Optional[float]] = []
-    salary_max: List[Optional[float]] = []
-    salary_missing: List[int] = []
-    unmatched_players: set[str] = set()
-
-    for _, row in entries.iterrows():
-        lineup_pairs: List[tuple[str, str]] = row.get("lineup_pairs", [])
-        salaries_for_entry: List[float] = []
-        missing_count = 0
-        for slot, player in lineup_pairs:
-            match = salary_lookup.get(player)
-            if match is None:
-                match = salary_lookup_secondary.get(comparable_name(player))
-            if match is None:
-                unmatched_players.add(player)
-            salary_value = match.get("Salary") if match else None
-            if match and isinstance(salary_value, (int, float)) and not math.isnan(salary_value):
-                salaries_for_entry.append(float(salary_value))
-            else:
-                missing_count += 1
-            exploded_rows.append(
-                {
-                    "entry_id": row["entry_id"],
-                    "username": row["username"],
-                    "rank": row["rank"],
-                    "percentile": row["percentile"],
-                    "points": row["points"],
-                    "player": player,
-                    "roster_slot": slot,
-                    "salary": salary_value if match else None,
-                    "dk_roster_position": match.get("Roster Position") if match else None,
-                    "team": match.get("TeamAbbrev") if match else None,
-                    "game_id": match.get("game_id") if match else None,
-                    "away_team": match.get("away_team") if match else None,
-                    "home_team": match.get("home_team") if match else None,
-                }
-            )
-        salary_missing.append(missing_count)
-        if salaries_for_entry:
-            salary_sum.append(float(sum(salaries_for_entry)))
-            salary_avg.append(float(mean(salaries_for_entry)))
-            salary_min.append(float(min(salaries_for_entry)))
-            salary_max.append(float(max(salaries_for_entry)))
-        else:
-            salary_sum.append(None)
-            salary_avg.append(None)
-            salary_min.append(None)
-            salary_max.append(None)
-
-    entries["salary_sum"] = salary_sum
-    entries["salary_avg"] = salary_avg
-    entries["salary_min"] = salary_min
-    entries["salary_max"] = salary_max
-    entries["salary_missing_count"] = salary_missing
-
-    entries_exploded = pd.DataFrame(exploded_rows)
-
-    field_records: List[dict] = []
-    for _, row in field_raw.iterrows():
-        player = normalize_player_name(row.get("Player"))
-        if not player:
-            continue
-        match = salary_lookup.get(player)
-        if match is None:
-            match = salary_lookup_secondary.get(comparable_name(player))
-        drafted_raw = row.get("%Drafted")
-        if isinstance(drafted_raw, str):
-            drafted_value = drafted_raw.replace("%", "").strip()
-        else:
-            drafted_value = drafted_raw
-        field_pct = pd.to_numeric(drafted_value, errors="coerce")
-        fpts = pd.to_numeric(row.get("FPTS"), errors="coerce")
-        field_records.append(
+    # One vectorized extract instead of a per-row parse_game_info call (and
+    # its GameInfo allocation) that only gets unpacked into columns anyway.
+    teams = salaries["Game Info"].str.strip().str.upper().str.extract(GAME_INFO_RE)
+    salaries["away_team"] = teams["away"]
+    salaries["home_team"] = teams["home"]
+    salaries["game_id"] = teams["away"] + "@" + teams["home"]
+
+    # One salary row per name; iterating the records last-one-wins, so keep
+    # the final duplicate when collapsing to an index.
+    salary_columns = {
+        "Salary": "salary",
+        "Roster Position": "dk_roster_position",
+        "TeamAbbrev": "team",
+        "game_id": "game_id",
+        "away_team": "away_team",
+        "home_team": "home_team",
+    }
+    # Both lookup tiers reduce to comparable_name (the exact Name is just the
+    # un-folded spelling of the same key), so one key-indexed frame and one
+    # aligned reindex replace the primary/fallback pair.
+    named_salaries = salaries.loc[salaries["Name"].notna()]
+    salary_by_key = named_salaries.drop_duplicates("name_key", keep="last").set_index("name_key")[list(salary_columns)]
+
+    # Explode lineups to one row per (entry, player) and resolve salaries in a
+    # single aligned reindex on the comparable-name key.
+    pairs = entries.loc[:, ["entry_id", "username", "rank", "percentile", "points", "lineup_slots", "lineup_players"]].explode(
+        ["lineup_slots", "lineup_players"]
+    )
+    pairs = pairs.rename(columns={"lineup_slots": "roster_slot", "lineup_players": "player"})
+    pairs = pairs.loc[pairs["player"].notna()]
+
+    pair_keys = pairs["player"].map(comparable_name)
+    matched = salary_by_key.reindex(pair_keys).set_axis(pairs.index)
+    matched_any = pair_keys.isin(salary_by_key.index).to_numpy()
+    unmatched_players: set[str] = set(pairs.loc[~matched_any, "player"])
+
+    entries_exploded = pd.concat([pairs, matched.rename(columns=salary_columns)], axis=1)
+    entries_exploded = entries_exploded.loc[:, [
+        "entry_id",
+        "username",
+        "rank",
+        "percentile",
+        "points",
+        "player",
+        "roster_slot",
+        "salary",
+        "dk_roster_position",
+        "team",
+        "game_id",
+        "away_team",
+        "home_team",
+    ]]
+
+    # Per-entry salary stats in one grouped pass; a lineup spot counts as
+    # missing when the player is unmatched or the salary cell is blank.
+    salary_valid = matched_any & entries_exploded["salary"].notna().to_numpy()
+    salary_stats = (
+        pd.DataFrame(
             {
-                "player": player,
-                "roster_position": row.get("Roster Position"),
-                "field_pct": float(field_pct) if not pd.isna(field_pct) else 0.0,
-                "fpts": float(fpts) if not pd.isna(fpts) else None,
-                "salary": match.get("Salary") if match else None,
-                "team": match.get("TeamAbbrev") if match else None,
-                "game_id": match.get("game_id") if match else None,
-                "away_team": match.get("away_team") if match else None,
-                "home_team": match.get("home_team") if match else None,
+                "entry_id": entries_exploded["entry_id"],
+                "salary": entries_exploded["salary"].where(salary_valid),
+                "missing": (~salary_valid).astype("int64"),
             }
         )
-    field_players = pd.DataFrame(field_records)
+        .groupby("entry_id", dropna=False)
+        .agg(
+            salary_sum=("salary", "sum"),
+            salary_avg=("salary", "mean"),
+            salary_min=("salary", "min"),
+            salary_max=("salary", "max"),
+            salary_count=("salary", "count"),
+            salary_missing_count=("missing", "sum"),
+        )
+    )
+    salary_stats.loc[salary_stats["salary_count"] == 0, "salary_sum"] = float("nan")
+    salary_stats = salary_stats.drop(columns=["salary_count"])
+    entries = entries.merge(salary_stats, left_on="entry_id", right_index=True, how="left")
+    entries["salary_missing_count"] = entries["salary_missing_count"].fillna(0).astype("int64")
+
+    if not entries_exploded.empty:
+        # Keep the exploded table sorted by entry_id so consumers can slice
+        # per-entry segments with searchsorted instead of full isin scans.
+        entries_exploded = entries_exploded.sort_values("entry_id", kind="stable").reset_index(drop=True)
+
+    # Field ownership rows get the same columnar treatment as the lineups:
+    # normalize once, strip the percent signs in one string pass, and resolve
+    # salary attributes with the indexed frames instead of per-row lookups.
+    field = field_raw.copy()
+    field["player"] = field["Player"].map(normalize_player_name)
+    field = field.loc[field["player"] != ""]
+    drafted = field["%Drafted"].astype("string").str.replace("%", "", regex=False).str.strip()
+    field["field_pct"] = pd.to_numeric(drafted, errors="coerce").fillna(0.0).astype(float)
+    field["fpts"] = pd.to_numeric(field["FPTS"], errors="coerce")
+    field = field.rename(columns={"Roster Position": "roster_position"})
+
+    field_keys = field["player"].map(comparable_name)
+    field_matched = salary_by_key.reindex(field_keys).set_axis(field.index)
+
+    field_players = pd.concat(
+        [
+            field.loc[:, ["player", "roster_position", "field_pct", "fpts"]],
+            field_matched.rename(columns=salary_columns).loc[:, ["salary", "team", "game_id", "away_team", "home_team"]],
+        ],
+        axis=1,
+    )
     if not field_players.empty:
         field_players = (
             field_players.groupby("player", as_index=False)
@@ -275,12 +298,18 @@ def ingest_contest(
         )
 
     user_exposure = aggregate.compute_user_exposure(entries, entries_exploded, field_players)
-    combo_tables = aggregate.compute_name_combos(entries, combo_config)
-    team_stacks = aggregate.compute_team_stacks(entries, entries_exploded, combo_config)
-    game_stacks = aggregate.compute_game_stacks(entries, entries_exploded, combo_config)
+    # Team and game stacks are independent of the name combos, so they run on
+    # worker threads while the combo enumeration (whose numba kernel must stay
+    # on the calling thread) proceeds here.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        team_future = pool.submit(aggregate.compute_team_stacks, entries, entries_exploded, combo_config)
+        game_future = pool.submit(aggregate.compute_game_stacks, entries, entries_exploded, combo_config)
+        combo_tables = aggregate.compute_name_combos(entries, combo_config)
+        team_stacks = team_future.result()
+        game_stacks = game_future.result()
 
     ingest_time = utc_timestamp()
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
     output_root = output_root or Path("data")
     output_dir = output_root / timestamp
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -303,7 +332,7 @@ def ingest_contest(
 
     tables: Dict[str, pd.DataFrame] = {
         "ContestMeta": contest_meta,
-        "Entries": entries.drop(columns=["lineup_pairs"]),
+        "Entries": entries,
         "EntriesExploded": entries_exploded,
         "FieldPlayers": field_players,
         "UserExposure": user_exposure,
@@ -314,9 +343,16 @@ def ingest_contest(
     for size, frame in combo_tables.items():
         tables[f"Combos{size}"] = frame
 
-    for name, frame in tables.items():
-        path = output_dir / f"{name}.parquet"
-        frame.to_parquet(path, index=False)
+    # Arrow releases the GIL while encoding, so the per-table writes overlap
+    # on a thread pool. zstd compresses smaller than the default snappy and
+    # decompresses faster on modern CPUs; the biggest table gets bounded row
+    # groups so downstream scans can parallelize.
+    def _write_table(name: str, frame: pd.DataFrame) -> None:
+        kwargs = {"row_group_size": 64_000} if name == "EntriesExploded" else {}
+        frame.to_parquet(output_dir / f"{name}.parquet", index=False, compression="zstd", **kwargs)
+
+    with ThreadPoolExecutor(max_workers=min(8, len(tables))) as pool:
+        list(pool.map(lambda item: _write_table(*item), tables.items()))
 
     return IngestResult(
         output_dir=output_dir,
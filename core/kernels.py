@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, prange
+
+__all__ = [
+    "combos_per_row",
+    "enumerate_combo_keys",
+    "unpack_combo_keys",
+]
+
+# Player codes are int16 categorical indices, so a size-4 combo packs into a
+# single int64 key: 16 bits per player, most significant first. Codes inside a
+# lineup row are sorted ascending, which keeps packed keys unique per combo.
+_CODE_BITS = 16
+
+
+def combos_per_row(lens: np.ndarray, size: int) -> np.ndarray:
+    """Return C(len, size) for each row without enumerating anything."""
+    k = lens.astype(np.int64)
+    if size == 2:
+        counts = k * (k - 1) // 2
+    elif size == 3:
+        counts = k * (k - 1) * (k - 2) // 6
+    elif size == 4:
+        counts = k * (k - 1) * (k - 2) * (k - 3) // 24
+    else:
+        raise ValueError(f"unsupported combo size: {size}")
+    return np.where(k >= size, counts, 0)
+
+
+@njit(cache=True, parallel=True, nogil=True)
+def enumerate_combo_keys(
+    players: np.ndarray,
+    lens: np.ndarray,
+    offsets: np.ndarray,
+    size: int,
+    keys: np.ndarray,
+    rows: np.ndarray,
+) -> None:
+    """Fill `keys`/`rows` with packed combo keys for every row of `players`.
+
+    `players` is int16[N, max_len] padded with -1, `offsets` the exclusive
+    prefix sum of per-row combo counts so each row writes a disjoint slice.
+    """
+    n = players.shape[0]
+    for i in prange(n):
+        k = lens[i]
+        if k < size:
+            continue
+        pos = offsets[i]
+        if size == 2:
+            for a in range(k - 1):
+                pa = np.int64(players[i, a]) << _CODE_BITS
+                for b in range(a + 1, k):
+                    keys[pos] = pa | np.int64(players[i, b])
+                    rows[pos] = i
+                    pos += 1
+        elif size == 3:
+            for a in range(k - 2):
+                pa = np.int64(players[i, a]) << (2 * _CODE_BITS)
+                for b in range(a + 1, k - 1):
+                    pb = pa | (np.int64(players[i, b]) << _CODE_BITS)
+                    for c in range(b + 1, k):
+                        keys[pos] = pb | np.int64(players[i, c])
+                        rows[pos] = i
+                        pos += 1
+        else:
+            for a in range(k - 3):
+                pa = np.int64(players[i, a]) << (3 * _CODE_BITS)
+                for b in range(a + 1, k - 2):
+                    pb = pa | (np.int64(players[i, b]) << (2 * _CODE_BITS))
+                    for c in range(b + 1, k - 1):
+                        pc = pb | (np.int64(players[i, c]) << _CODE_BITS)
+                        for d in range(c + 1, k):
+                            keys[pos] = pc | np.int64(players[i, d])
+                            rows[pos] = i
+                            pos += 1
+
+
+def unpack_combo_keys(keys: np.ndarray, size: int) -> np.ndarray:
+    """Invert the packing above: int64 keys -> int16[M, size] player codes."""
+    codes = np.empty((len(keys), size), dtype=np.int16)
+    for slot in range(size):
+        shift = (size - 1 - slot) * _CODE_BITS
+        codes[:, slot] = (keys >> shift) & ((1 << _CODE_BITS) - 1)
+    return codes
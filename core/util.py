@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import re
+import sys
 import unicodedata
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from datetime import datetime, timezone
 from typing import Iterable, Optional
 
 __all__ = [
     "GameInfo",
+    "GAME_INFO_RE",
     "normalize_player_name",
     "comparable_name",
     "short_hash",
     "percentile_from_rank",
+    "percentile_from_rank_array",
     "slugify",
 ]
 
@@ -24,28 +30,48 @@ class GameInfo:
     game_id: Optional[str]
 
 
-_GAME_RE = re.compile(r"(?P<away>[A-Z]{2,3})@(?P<home>[A-Z]{2,3})")
+# Public so ingest can feed the same pattern to Series.str.extract.
+GAME_INFO_RE = re.compile(r"(?P<away>[A-Z]{2,3})@(?P<home>[A-Z]{2,3})")
 _PUNCT_RE = re.compile(r"[^a-z0-9 ]+")
+_WS_RE = re.compile(r"\s+")
 
 
-def normalize_player_name(name: Optional[str]) -> str:
-    """Return a canonical player string with normalized whitespace."""
-    if not name:
-        return ""
+@lru_cache(maxsize=200_000)
+def _normalize_cached(name: str) -> str:
     normalized = unicodedata.normalize("NFKD", name)
     normalized = normalized.encode("ascii", "ignore").decode("ascii")
-    normalized = re.sub(r"\s+", " ", normalized.strip())
-    return normalized
+    # Interned so repeated occurrences (lineups, salary keys, exploded rows)
+    # share one string object and dict lookups compare by identity.
+    return sys.intern(_WS_RE.sub(" ", normalized.strip()))
+
+
+@lru_cache(maxsize=200_000)
+def _comparable_cached(name: str) -> str:
+    return sys.intern(_PUNCT_RE.sub("", _normalize_cached(name).lower()))
+
+
+def normalize_player_name(name: Optional[str]) -> str:
+    """Return a canonical player string with normalized whitespace.
+
+    Ingest normalizes the same names many times over (lineups, salary keys,
+    field rows), so the pure unicode work is memoized per distinct string.
+    """
+    if not name or not isinstance(name, str):
+        return ""
+    return _normalize_cached(name)
 
 
 def comparable_name(name: Optional[str]) -> str:
     """Return a lowercase punctuation-free variant for fuzzy matching."""
-    normalized = normalize_player_name(name).lower()
-    return _PUNCT_RE.sub("", normalized)
+    if not name or not isinstance(name, str):
+        return ""
+    return _comparable_cached(name)
 
 
 def short_hash(value: str, length: int = 12) -> str:
-    digest = hashlib.sha1(value.encode("utf-8")).hexdigest()
+    # Non-cryptographic fingerprint; blake2b with a matching digest size is
+    # markedly cheaper than truncating a full sha1.
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=(length + 1) // 2).hexdigest()
     return digest[:length]
 
 
@@ -55,10 +81,22 @@ def percentile_from_rank(rank: int, total: int) -> float:
     return (max(rank - 1, 0) / (total - 1)) * 100.0
 
 
+def percentile_from_rank_array(ranks: np.ndarray, total: int) -> np.ndarray:
+    """Vectorized percentile_from_rank over a whole rank array."""
+    if total <= 1:
+        return np.zeros(len(ranks), dtype=np.float64)
+    return np.maximum(ranks - 1.0, 0.0) / (total - 1) * 100.0
+
+
+@lru_cache(maxsize=8)
+def _sep_collapse_re(sep: str) -> re.Pattern[str]:
+    return re.compile(re.escape(sep) + "{2,}")
+
+
 def slugify(value: str, sep: str = "-") -> str:
     normalized = comparable_name(value)
     normalized = normalized.replace(" ", sep)
-    normalized = re.sub(rf"{sep}{{2,}}", sep, normalized)
+    normalized = _sep_collapse_re(sep).sub(sep, normalized)
     return normalized.strip(sep)
 
 
@@ -66,7 +104,7 @@ def parse_game_info(info: Optional[str]) -> GameInfo:
     if not info or isinstance(info, float):
         return GameInfo(None, None, None)
     info = info.strip().upper()
-    match = _GAME_RE.search(info)
+    match = GAME_INFO_RE.search(info)
     if not match:
         return GameInfo(None, None, None)
     away = match.group("away")
@@ -75,7 +113,9 @@ def parse_game_info(info: Optional[str]) -> GameInfo:
 
 
 def utc_timestamp() -> str:
-    return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    # datetime.utcnow() is deprecated; use an aware now and drop the tzinfo
+    # so the rendered format stays identical.
+    return datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None).isoformat() + "Z"
 
 
 def flatten(iterable: Iterable[Iterable[str]]) -> list[str]: